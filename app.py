@@ -1,12 +1,23 @@
 import streamlit as st
 import pandas as pd
 import io
-import plotly.express as px
-import plotly.graph_objects as go
+import hashlib
 from datetime import datetime, timedelta
 from report_processor import DailyReportProcessor
 from sample_data import generate_sample_data, save_sample_excel
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Prefer the Rust-backed calamine reader when installed
+try:
+    import python_calamine
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = None
+
 # Page configuration
 st.set_page_config(
     page_title="Daily Staff Report Review Agent",
@@ -45,6 +56,179 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Without calamine, uploads above this size are read row by row to bound peak memory
+STREAMING_THRESHOLD_BYTES = 5_000_000
+
+def _read_excel_streaming(buf, chunk=50_000) -> pd.DataFrame:
+    """Read the active sheet through openpyxl's read-only row iterator in chunks"""
+    import openpyxl
+    
+    wb = openpyxl.load_workbook(buf, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        
+        frames = []
+        batch = []
+        for row in rows:
+            # Skip fully blank rows, which read-only sheets often carry at the end
+            if all(value is None for value in row):
+                continue
+            batch.append(row)
+            if len(batch) >= chunk:
+                frames.append(pd.DataFrame(batch, columns=header))
+                batch = []
+        if batch or not frames:
+            frames.append(pd.DataFrame(batch, columns=header))
+        
+        return pd.concat(frames, ignore_index=True)
+    finally:
+        wb.close()
+
+def _digest(data: bytes) -> str:
+    """Short content hash used as a cache key, xxh3 when available"""
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+@st.cache_data(show_spinner=False)
+def _load_excel(file_key: str, name: str, _data: bytes) -> pd.DataFrame:
+    """Parse uploaded Excel bytes once and reuse the DataFrame across reruns"""
+    if EXCEL_ENGINE is None and len(_data) > STREAMING_THRESHOLD_BYTES and name.lower().endswith('.xlsx'):
+        return _read_excel_streaming(io.BytesIO(_data))
+    return pd.read_excel(io.BytesIO(_data), engine=EXCEL_ENGINE)
+
+def _df_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of a DataFrame, used as an explicit cache key"""
+    return _digest(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+
+def _get_processor() -> DailyReportProcessor:
+    """Return this session's processor, created on first use"""
+    # Kept per session rather than in cache_resource: process_reports
+    # resets and fills instance state, so sharing across sessions would race
+    if 'processor' not in st.session_state:
+        st.session_state.processor = DailyReportProcessor()
+    return st.session_state.processor
+
+# Low-cardinality result column stored as categorical (Priority already is)
+ACTION_DTYPE = pd.CategoricalDtype(['Follow-up', 'Escalate'])
+
+@st.cache_data(show_spinner=False)
+def _cached_process(df_hash: str, _df: pd.DataFrame):
+    """Run the report analysis once per distinct input DataFrame"""
+    results_df, errors, warnings = _get_processor().process_reports(_df)
+    if not results_df.empty:
+        results_df['Action'] = results_df['Action'].astype(ACTION_DTYPE)
+    return results_df, errors, warnings
+
+@st.cache_data(show_spinner=False)
+def _cached_summary(df_hash: str, _results_df: pd.DataFrame) -> dict:
+    """Build the summary statistics once per distinct input DataFrame"""
+    return _get_processor().generate_summary_report(_results_df)
+
+@st.cache_data(show_spinner=False, ttl=timedelta(days=1))
+def _cached_sample(seed: int = 0) -> pd.DataFrame:
+    """Generate the demo dataset once and reuse it across reruns"""
+    return generate_sample_data()
+
+@st.cache_data(show_spinner=False)
+def _build_csv_report(df_hash: str, _results_df: pd.DataFrame) -> str:
+    """Render the results table as CSV text"""
+    return _results_df.to_csv(index=False)
+
+@st.cache_data(show_spinner=False)
+def _build_excel_report(df_hash: str, _results_df: pd.DataFrame, summary: dict) -> bytes:
+    """Create Excel workbook with results, summary and employee breakdown sheets"""
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        _results_df.to_excel(writer, sheet_name='Analysis Results', index=False)
+        
+        # Summary sheet
+        summary_df = pd.DataFrame([summary])
+        summary_df.to_excel(writer, sheet_name='Summary', index=False)
+        
+        # Employee breakdown
+        if not _results_df.empty:
+            employee_breakdown = _results_df.groupby('Employee', observed=True).agg(**{
+                'Total Issues': ('Task', 'count'),
+                'Days Missed': ('Days Missed', 'sum')
+            })
+            # Join distinct priorities on the deduplicated pairs only
+            employee_breakdown['Priority'] = (
+                _results_df[['Employee', 'Priority']].drop_duplicates()
+                .groupby('Employee', observed=True)['Priority'].agg(', '.join)
+            )
+            employee_breakdown.to_excel(writer, sheet_name='Employee Breakdown')
+    
+    return buffer.getvalue()
+
+@st.cache_data(show_spinner=False)
+def _build_action_plan(df_hash: str, _results_df: pd.DataFrame) -> str:
+    """Generate the plain-text action plan"""
+    action_plan = [
+        f"🔴 URGENT: Contact {employee} about {task} (missed {days} days)"
+        if action == 'Escalate' else
+        f"🟡 Follow up with {employee} about {task}"
+        for employee, task, days, action in zip(
+            _results_df['Employee'].to_numpy(),
+            _results_df['Task'].to_numpy(),
+            _results_df['Days Missed'].to_numpy(),
+            _results_df['Action'].to_numpy()
+        )
+    ]
+    
+    return "\n".join(action_plan)
+
+# Status spellings folded into the two canonical codes
+STATUS_CANONICAL = {
+    'done': 'Done',
+    'complete': 'Done',
+    'completed': 'Done',
+    'not done': 'NotDone',
+    'notdone': 'NotDone',
+    'incomplete': 'NotDone',
+    'missed': 'NotDone'
+}
+
+@st.cache_data(show_spinner=False)
+def _prepare_data(df_hash: str, _df: pd.DataFrame):
+    """Validate, normalize column types and compute preview metrics in one cached pass"""
+    is_valid, message = _get_processor().validate_data(_df)
+    if not is_valid:
+        return is_valid, message, _df, {}
+    
+    df = _df.copy(deep=False)
+    
+    # Parse dates once so downstream steps skip re-parsing
+    if not pd.api.types.is_datetime64_any_dtype(df['Date']):
+        df['Date'] = pd.to_datetime(df['Date'], errors='coerce', format='mixed')
+    
+    # Store repeated text columns as categoricals
+    for c in ('Employee', 'Task'):
+        if not isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = df[c].astype('string').str.strip().astype('category')
+    
+    # Canonical status codes; unrecognized values are kept as entered
+    status = df['Status'].astype('string').str.strip()
+    df['Status'] = status.str.lower().map(STATUS_CANONICAL).fillna(status).astype('category')
+    
+    try:
+        date_range = f"{df['Date'].min().strftime('%Y-%m-%d')} to {df['Date'].max().strftime('%Y-%m-%d')}" if len(df) > 0 else "N/A"
+    except ValueError:
+        date_range = "Invalid dates"
+    
+    metrics = {
+        'total_records': len(df),
+        'employees': df['Employee'].nunique(),
+        'unique_tasks': df['Task'].nunique(),
+        'not_done': int((df['Status'] == 'NotDone').sum()),
+        'date_range': date_range
+    }
+    
+    return is_valid, message, df, metrics
+
 def display_priority_badge(priority):
     """Display priority with color coding"""
     colors = {
@@ -55,6 +239,19 @@ def display_priority_badge(priority):
     }
     return f"{colors.get(priority, '⚪')} {priority}"
 
+@st.cache_resource(show_spinner=False)
+def _employee_chart(employee_issues: pd.Series):
+    """Build the top-employees bar chart, reused across reruns"""
+    import plotly.express as px
+    
+    return px.bar(
+        x=employee_issues.values,
+        y=employee_issues.index,
+        orientation='h',
+        title="Top 10 Employees with Most Issues",
+        labels={'x': 'Number of Issues', 'y': 'Employee'}
+    )
+
 def create_visualizations(results_df, summary):
     """Create data visualizations"""
     if results_df.empty:
@@ -64,45 +261,22 @@ def create_visualizations(results_df, summary):
     col1, col2 = st.columns(2)
     
     with col1:
-        # Action breakdown pie chart
+        # Action breakdown chart
         if summary['action_breakdown']:
-            fig_actions = px.pie(
-                values=list(summary['action_breakdown'].values()),
-                names=list(summary['action_breakdown'].keys()),
-                title="Actions Required Distribution",
-                color_discrete_map={'Follow-up': '#36a2eb', 'Escalate': '#ff6384'}
-            )
-            st.plotly_chart(fig_actions, use_container_width=True)
+            st.markdown("**Actions Required Distribution**")
+            st.bar_chart(pd.Series(summary['action_breakdown'], name='Issues'))
     
     with col2:
-        # Priority breakdown bar chart
+        # Priority breakdown chart
         if summary['priority_breakdown']:
-            fig_priority = px.bar(
-                x=list(summary['priority_breakdown'].keys()),
-                y=list(summary['priority_breakdown'].values()),
-                title="Issues by Priority Level",
-                color=list(summary['priority_breakdown'].keys()),
-                color_discrete_map={
-                    'Critical': '#dc3545',
-                    'High': '#fd7e14', 
-                    'Medium': '#ffc107',
-                    'Low': '#28a745'
-                }
-            )
-            st.plotly_chart(fig_priority, use_container_width=True)
+            st.markdown("**Issues by Priority Level**")
+            st.bar_chart(pd.Series(summary['priority_breakdown'], name='Issues'))
     
     # Employee performance chart
     if len(results_df) > 0:
-        employee_issues = results_df['Employee'].value_counts().head(10)
+        employee_issues = results_df['Employee'].value_counts(sort=False).nlargest(10)
         if len(employee_issues) > 0:
-            fig_employees = px.bar(
-                x=employee_issues.values,
-                y=employee_issues.index,
-                orientation='h',
-                title="Top 10 Employees with Most Issues",
-                labels={'x': 'Number of Issues', 'y': 'Employee'}
-            )
-            st.plotly_chart(fig_employees, use_container_width=True)
+            st.plotly_chart(_employee_chart(employee_issues), use_container_width=True)
 
 def main():
     st.title("📊 Daily Staff Report Review Agent")
@@ -137,9 +311,6 @@ def main():
             - Priority-based sorting
             """)
     
-    # Initialize processor
-    processor = DailyReportProcessor()
-    
     # Sidebar for options
     st.sidebar.header("⚙️ Configuration")
     
@@ -154,6 +325,7 @@ def main():
         show_warnings = st.checkbox("Show data warnings", value=True)
         show_visualizations = st.checkbox("Show visualizations", value=True)
         auto_analyze = st.checkbox("Auto-analyze on upload", value=False)
+        page_size = int(st.number_input("Rows per page", min_value=10, value=50, step=10))
     
     # Initialize session state for data
     if 'df' not in st.session_state:
@@ -187,7 +359,8 @@ def main():
                 
                 # Read the file with error handling
                 try:
-                    df = pd.read_excel(uploaded_file)
+                    data = uploaded_file.getvalue()
+                    df = _load_excel(_digest(data), uploaded_file.name, data)
                     st.session_state.df = df
                     st.success(f"✅ File uploaded successfully! {len(df)} records found.")
                 except Exception as read_error:
@@ -207,7 +380,7 @@ def main():
         with col1:
             if st.button("🎲 Generate Sample Data", type="primary"):
                 with st.spinner("Generating sample data..."):
-                    df = generate_sample_data()
+                    df = _cached_sample()
                     st.session_state.df = df
                     st.session_state.data_generated = True
                 st.success(f"✅ Sample data generated! {len(df)} records created.")
@@ -232,8 +405,9 @@ def main():
         df = st.session_state.df
     
     if df is not None:
-        # Enhanced data validation
-        is_valid, message = processor.validate_data(df)
+        # Validation, type normalization and preview metrics share one cached pass
+        df_hash = _df_fingerprint(df)
+        is_valid, message, df, metrics = _prepare_data(df_hash, df)
         
         if not is_valid:
             st.error(f"❌ {message}")
@@ -255,41 +429,42 @@ def main():
         # Data summary metrics
         col1, col2, col3, col4, col5 = st.columns(5)
         with col1:
-            st.metric("📋 Total Records", len(df))
+            st.metric("📋 Total Records", metrics['total_records'])
         with col2:
-            st.metric("👥 Employees", df['Employee'].nunique())
+            st.metric("👥 Employees", metrics['employees'])
         with col3:
-            st.metric("📝 Unique Tasks", df['Task'].nunique())
+            st.metric("📝 Unique Tasks", metrics['unique_tasks'])
         with col4:
-            # Fix the status checking logic
-            status_check = df['Status'].astype(str).str.upper()
-            not_done_count = len(df[status_check.isin(['NOT DONE', 'NOTDONE', 'INCOMPLETE', 'MISSED'])])
-            st.metric("❌ Not Done Tasks", not_done_count)
+            st.metric("❌ Not Done Tasks", metrics['not_done'])
         with col5:
-            try:
-                # Convert dates properly for display
-                df_temp = df.copy()
-                df_temp['Date'] = pd.to_datetime(df_temp['Date'], errors='coerce')
-                date_range = f"{df_temp['Date'].min().strftime('%Y-%m-%d')} to {df_temp['Date'].max().strftime('%Y-%m-%d')}" if len(df_temp) > 0 else "N/A"
-                st.metric("📅 Date Range", "")
-                st.caption(date_range)
-            except:
-                st.metric("📅 Date Range", "")
-                st.caption("Invalid dates")
+            st.metric("📅 Date Range", "")
+            st.caption(metrics['date_range'])
         
-        # Show data preview table
-        with st.expander("👁️ View Data Details", expanded=False):
-            st.dataframe(df, use_container_width=True)
+        # Show data preview table only when requested, capped to the first rows
+        if st.toggle("👁️ View Data Details", value=False):
+            st.dataframe(df.head(1000), use_container_width=True)
+            if len(df) > 1000:
+                st.caption(f"Showing first 1000 of {len(df)} records")
         
         # Process reports
         st.subheader("🔍 Analysis Results")
         
         analyze_button = st.button("🚀 Analyze Reports", type="primary") or (auto_analyze and df is not None)
         
+        # Remember which data was analyzed so later reruns keep showing results
         if analyze_button:
+            st.session_state.analyzed_hash = df_hash
+        
+        if st.session_state.get('analyzed_hash') == df_hash:
             with st.spinner("🔄 Processing reports... This may take a moment for large datasets."):
                 try:
-                    results_df, errors, warnings = processor.process_reports(df)
+                    # Only recompute when the analyzed data has changed
+                    if st.session_state.get('analysis_hash') != df_hash:
+                        results_df, errors, warnings = _cached_process(df_hash, df)
+                        summary = _cached_summary(df_hash, results_df)
+                        st.session_state.analysis = (results_df, errors, warnings, summary)
+                        st.session_state.analysis_hash = df_hash
+                    results_df, errors, warnings, summary = st.session_state.analysis
                     
                     # Display errors if any
                     if errors:
@@ -312,9 +487,13 @@ def main():
                         # Enhanced results display with priority colors
                         st.markdown("### 📋 Detailed Results")
                         
+                        # Only send the current page of results to the browser
+                        page_count = (len(results_df) - 1) // page_size + 1
+                        page = int(st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1))
+                        
                         # Display the results table with proper formatting
                         st.dataframe(
-                            results_df,
+                            results_df.iloc[(page - 1) * page_size: page * page_size],
                             use_container_width=True,
                             column_config={
                                 "Priority": st.column_config.TextColumn("Priority", width="small"),
@@ -323,9 +502,7 @@ def main():
                             }
                         )
                         
-                        # Generate and display summary
-                        summary = processor.generate_summary_report(results_df)
-                        
+                        # Display summary
                         st.markdown("### 📈 Summary Statistics")
                         
                         # Enhanced metrics display
@@ -371,7 +548,7 @@ def main():
                         col1, col2, col3 = st.columns(3)
                         
                         with col1:
-                            csv = results_df.to_csv(index=False)
+                            csv = _build_csv_report(df_hash, results_df)
                             st.download_button(
                                 label="📄 Download Results (CSV)",
                                 data=csv,
@@ -380,41 +557,15 @@ def main():
                             )
                         
                         with col2:
-                            # Create Excel with multiple sheets
-                            buffer = io.BytesIO()
-                            with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-                                results_df.to_excel(writer, sheet_name='Analysis Results', index=False)
-                                
-                                # Summary sheet
-                                summary_df = pd.DataFrame([summary])
-                                summary_df.to_excel(writer, sheet_name='Summary', index=False)
-                                
-                                # Employee breakdown
-                                if not results_df.empty:
-                                    employee_breakdown = results_df.groupby('Employee').agg({
-                                        'Task': 'count',
-                                        'Days Missed': 'sum',
-                                        'Priority': lambda x: ', '.join(x.unique())
-                                    }).rename(columns={'Task': 'Total Issues'})
-                                    employee_breakdown.to_excel(writer, sheet_name='Employee Breakdown')
-                            
                             st.download_button(
                                 label="📊 Download Full Report (Excel)",
-                                data=buffer.getvalue(),
+                                data=_build_excel_report(df_hash, results_df, summary),
                                 file_name=f"staff_report_full_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
                                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
                             )
                         
                         with col3:
-                            # Generate action plan
-                            action_plan = []
-                            for _, row in results_df.iterrows():
-                                if row['Action'] == 'Escalate':
-                                    action_plan.append(f"🔴 URGENT: Contact {row['Employee']} about {row['Task']} (missed {row['Days Missed']} days)")
-                                else:
-                                    action_plan.append(f"🟡 Follow up with {row['Employee']} about {row['Task']}")
-                            
-                            action_text = "\n".join(action_plan)
+                            action_text = _build_action_plan(df_hash, results_df)
                             st.download_button(
                                 label="📋 Download Action Plan",
                                 data=action_text,
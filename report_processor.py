@@ -1,4 +1,6 @@
 import pandas as pd
+import numpy as np
+import re
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 import logging
@@ -7,9 +9,44 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Status values (after upper-casing in cleaning) that count as a missed task
+NOT_DONE_STATES = frozenset({'NOT DONE', 'NOTDONE', 'INCOMPLETE', 'MISSED'})
+
+# Task keywords (lowercase) that raise priority: critical for safety and
+# compliance related tasks, high for quality and customer facing ones
+CRITICAL_KEYWORDS = frozenset({'safety', 'security', 'compliance', 'audit', 'emergency', 'critical'})
+HIGH_KEYWORDS = frozenset({'quality', 'customer', 'client', 'deadline', 'urgent'})
+CRITICAL_RE = re.compile('|'.join(sorted(CRITICAL_KEYWORDS)))
+HIGH_RE = re.compile('|'.join(sorted(HIGH_KEYWORDS)))
+
+# Priority levels, most urgent first
+PRIORITY_DTYPE = pd.CategoricalDtype(['Critical', 'High', 'Medium', 'Low'], ordered=True)
+
+# Dates at least this far apart (in nanoseconds) break a run; allows for weekends
+RUN_GAP_NS = 4 * 24 * 60 * 60 * 10**9
+
+if njit is not None:
+    @njit(cache=True)
+    def _label_runs_kernel(employees, tasks, dates):
+        """Single-pass run labelling over rows sorted by employee, task and date"""
+        labels = np.empty(len(dates), dtype=np.int64)
+        label = 0
+        for i in range(len(dates)):
+            if i > 0 and (employees[i] != employees[i - 1] or tasks[i] != tasks[i - 1]
+                          or dates[i] - dates[i - 1] >= RUN_GAP_NS):
+                label += 1
+            labels[i] = label
+        return labels
+else:
+    _label_runs_kernel = None
+
 class DailyReportProcessor:
     def __init__(self):
-        self.results = []
         self.errors = []
         self.warnings = []
     
@@ -20,8 +57,7 @@ class DailyReportProcessor:
         Returns:
             Tuple of (results_df, errors, warnings)
         """
-        # Reset results and error tracking
-        self.results = []
+        # Reset error tracking
         self.errors = []
         self.warnings = []
         
@@ -34,60 +70,50 @@ class DailyReportProcessor:
                 return pd.DataFrame(columns=['Employee', 'Task', 'Date(s) Missed', 'Action', 'Priority', 'Days Missed']), self.errors, self.warnings
             
             # Filter for 'Not Done' tasks only
-            not_done_tasks = df_clean[df_clean['Status'].str.upper().isin(['NOT DONE', 'NOTDONE', 'INCOMPLETE', 'MISSED'])].copy()
+            not_done_tasks = df_clean[df_clean['Status'].isin(NOT_DONE_STATES)]
             
             if not_done_tasks.empty:
                 self.warnings.append("No missed tasks found in the data")
                 return pd.DataFrame(columns=['Employee', 'Task', 'Date(s) Missed', 'Action', 'Priority', 'Days Missed']), self.errors, self.warnings
             
-            # Group by Employee and Task to analyze patterns
-            grouped = not_done_tasks.groupby(['Employee', 'Task'])
+            # Sort once so each Employee/Task block is in date order (sorting returns a new frame,
+            # so the filtered slice above needs no defensive copy)
+            not_done_tasks = not_done_tasks.sort_values(['Employee', 'Task', 'Date'], kind='stable')
             
-            for (employee, task), group in grouped:
-                try:
-                    # Sort dates to check for consecutive misses
-                    dates = sorted(group['Date'].tolist())
-                    
-                    # Analyze consecutive patterns
-                    consecutive_groups = self._find_consecutive_groups(dates)
-                    
-                    for date_group in consecutive_groups:
-                        priority = self._calculate_priority(len(date_group), task)
-                        
-                        if len(date_group) == 1:
-                            # Single miss - Follow-up
-                            self.results.append({
-                                'Employee': employee,
-                                'Task': task,
-                                'Date(s) Missed': date_group[0].strftime('%Y-%m-%d'),
-                                'Action': 'Follow-up',
-                                'Priority': priority,
-                                'Days Missed': 1
-                            })
-                        else:
-                            # Multiple consecutive days - Escalate
-                            date_range = f"{date_group[0].strftime('%Y-%m-%d')} to {date_group[-1].strftime('%Y-%m-%d')}"
-                            self.results.append({
-                                'Employee': employee,
-                                'Task': task,
-                                'Date(s) Missed': date_range,
-                                'Action': 'Escalate',
-                                'Priority': priority,
-                                'Days Missed': len(date_group)
-                            })
-                            
-                except Exception as e:
-                    self.errors.append(f"Error processing {employee} - {task}: {str(e)}")
-                    logger.error(f"Error processing {employee} - {task}: {str(e)}")
+            # Label each run of consecutive misses
+            run_labels = self._label_runs(
+                not_done_tasks['Employee'].cat.codes.to_numpy(),
+                not_done_tasks['Task'].cat.codes.to_numpy(),
+                not_done_tasks['Date'].to_numpy(dtype='datetime64[ns]').view('i8')
+            )
+            # Labels are already increasing in sorted row order, so group keys need no re-sort
+            runs = not_done_tasks.groupby(run_labels, sort=False).agg(
+                Employee=('Employee', 'first'),
+                Task=('Task', 'first'),
+                start=('Date', 'min'),
+                end=('Date', 'max'),
+                days=('Date', 'size')
+            ).reset_index(drop=True)
             
-            results_df = pd.DataFrame(self.results)
+            # Single miss - Follow-up, multiple consecutive days - Escalate
+            # Result columns are built directly from the run arrays
+            single = runs['days'] == 1
+            # Day-resolution ISO strings (YYYY-MM-DD) formatted in numpy without per-value strftime
+            start = np.datetime_as_string(runs['start'].to_numpy(dtype='datetime64[ns]'), unit='D')
+            end = np.datetime_as_string(runs['end'].to_numpy(dtype='datetime64[ns]'), unit='D')
+            results_df = pd.DataFrame({
+                'Employee': runs['Employee'].astype(str),
+                'Task': runs['Task'].astype(str),
+                'Date(s) Missed': np.where(single, start, np.char.add(np.char.add(start, ' to '), end)),
+                'Action': np.where(single, 'Follow-up', 'Escalate'),
+                'Priority': self._calculate_priorities(runs['days'], runs['Task']),
+                'Days Missed': runs['days']
+            }, copy=False)
             
             # Sort by priority and days missed
             if not results_df.empty:
-                priority_order = {'Critical': 0, 'High': 1, 'Medium': 2, 'Low': 3}
-                results_df['priority_sort'] = results_df['Priority'].map(priority_order)
-                results_df = results_df.sort_values(['priority_sort', 'Days Missed'], ascending=[True, False])
-                results_df = results_df.drop('priority_sort', axis=1)
+                results_df['Priority'] = pd.Categorical(results_df['Priority'], dtype=PRIORITY_DTYPE)
+                results_df = results_df.sort_values(['Priority', 'Days Missed'], ascending=[True, False])
             
             return results_df, self.errors, self.warnings
             
@@ -99,57 +125,33 @@ class DailyReportProcessor:
     def _clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean and validate the input data"""
         try:
-            df_clean = df.copy()
-            
-            # Remove rows with missing critical data
-            initial_count = len(df_clean)
-            df_clean = df_clean.dropna(subset=['Employee', 'Task', 'Date', 'Status'])
+            # Remove rows with missing critical data; dropna returns a new frame,
+            # so the caller's DataFrame is never modified and no upfront copy is needed
+            initial_count = len(df)
+            df_clean = df.dropna(subset=['Employee', 'Task', 'Date', 'Status'])
             
             if len(df_clean) < initial_count:
                 self.warnings.append(f"Removed {initial_count - len(df_clean)} rows with missing critical data")
             
+            # Text is cleaned with Arrow string kernels, then stored as categoricals
+            # so grouping and filtering work on integer codes
+            
             # Clean employee names
-            df_clean['Employee'] = df_clean['Employee'].astype(str).str.strip().str.title()
+            df_clean['Employee'] = df_clean['Employee'].astype('string[pyarrow]').str.strip().str.title().astype('category')
             
             # Clean task names
-            df_clean['Task'] = df_clean['Task'].astype(str).str.strip()
+            df_clean['Task'] = df_clean['Task'].astype('string[pyarrow]').str.strip().astype('category')
             
             # Clean status values
-            df_clean['Status'] = df_clean['Status'].astype(str).str.strip().str.upper()
+            df_clean['Status'] = df_clean['Status'].astype('string[pyarrow]').str.strip().str.upper().astype('category')
             
             # Convert dates with error handling
-            date_errors = 0
-            for idx, date_val in df_clean['Date'].items():
-                try:
-                    if pd.isna(date_val):
-                        df_clean = df_clean.drop(idx)
-                        date_errors += 1
-                        continue
-                    
-                    # Try to parse different date formats
-                    if isinstance(date_val, str):
-                        # Common date formats
-                        for fmt in ['%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%Y/%m/%d', '%m-%d-%Y', '%d-%m-%Y']:
-                            try:
-                                df_clean.at[idx, 'Date'] = pd.to_datetime(date_val, format=fmt)
-                                break
-                            except:
-                                continue
-                        else:
-                            # If no format worked, try pandas auto-parsing
-                            df_clean.at[idx, 'Date'] = pd.to_datetime(date_val, errors='coerce')
-                    else:
-                        df_clean.at[idx, 'Date'] = pd.to_datetime(date_val, errors='coerce')
-                        
-                    if pd.isna(df_clean.at[idx, 'Date']):
-                        df_clean = df_clean.drop(idx)
-                        date_errors += 1
-                        
-                except Exception as e:
-                    df_clean = df_clean.drop(idx)
-                    date_errors += 1
+            df_clean['Date'] = self._parse_dates(df_clean['Date'])
+            valid_dates = df_clean['Date'].notna()
+            date_errors = int((~valid_dates).sum())
             
             if date_errors > 0:
+                df_clean = df_clean.loc[valid_dates]
                 self.warnings.append(f"Removed {date_errors} rows with invalid dates")
             
             # Remove duplicates
@@ -165,54 +167,61 @@ class DailyReportProcessor:
             self.errors.append(f"Error in data cleaning: {str(e)}")
             return pd.DataFrame()
     
-    def _find_consecutive_groups(self, dates: List[datetime]) -> List[List[datetime]]:
-        """Find groups of consecutive dates with improved logic"""
-        if not dates:
-            return []
+    def _parse_dates(self, dates: pd.Series) -> pd.Series:
+        """Parse a Date column, trying the common formats on the whole column at once"""
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            return dates
         
-        groups = []
-        current_group = [dates[0]]
+        parsed = pd.Series(pd.NaT, index=dates.index, dtype='datetime64[ns]')
+        is_str = dates.map(lambda value: isinstance(value, str)).astype(bool)
+        strings = dates[is_str]
         
-        for i in range(1, len(dates)):
-            # Check if current date is consecutive to the previous one (within 1-2 days to account for weekends)
-            days_diff = (dates[i] - dates[i-1]).days
-            if days_diff <= 3:  # Allow for weekends
-                current_group.append(dates[i])
-            else:
-                # Start a new group
-                groups.append(current_group)
-                current_group = [dates[i]]
+        # Common date formats, first matching format wins for each value
+        for fmt in ['%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%Y/%m/%d', '%m-%d-%Y', '%d-%m-%Y']:
+            parsed = parsed.fillna(pd.to_datetime(strings, format=fmt, errors='coerce'))
         
-        # Add the last group
-        groups.append(current_group)
-        
-        return groups
-    
-    def _calculate_priority(self, days_missed: int, task: str) -> str:
-        """Calculate priority based on days missed and task type"""
-        # Critical tasks (safety, compliance related)
-        critical_keywords = ['safety', 'security', 'compliance', 'audit', 'emergency', 'critical']
-        high_keywords = ['quality', 'customer', 'client', 'deadline', 'urgent']
+        # If no format worked, try pandas auto-parsing per value
+        unparsed = is_str & parsed.isna()
+        if unparsed.any():
+            parsed = parsed.fillna(pd.to_datetime(dates[unparsed], format='mixed', errors='coerce'))
         
-        task_lower = task.lower()
+        # Non-string values (datetime objects, Excel serials, ...)
+        if not is_str.all():
+            parsed = parsed.fillna(pd.to_datetime(dates[~is_str], errors='coerce'))
         
-        # Check if it's a critical task
-        if any(keyword in task_lower for keyword in critical_keywords):
-            return 'Critical' if days_missed >= 1 else 'High'
+        return parsed
+    
+    def _label_runs(self, employees: np.ndarray, tasks: np.ndarray, dates: np.ndarray) -> np.ndarray:
+        """Label runs of consecutive dates in rows sorted by employee, task and date (dates as int64 ns)"""
+        if _label_runs_kernel is not None:
+            return _label_runs_kernel(employees, tasks, dates)
         
-        # Check if it's a high priority task
-        if any(keyword in task_lower for keyword in high_keywords):
-            return 'Critical' if days_missed >= 3 else 'High'
+        # A run continues for the same employee and task while dates are
+        # within 3 days of each other (allows for weekends)
+        starts = np.zeros(len(dates), dtype=bool)
+        starts[1:] = (
+            (np.diff(employees) != 0)
+            | (np.diff(tasks) != 0)
+            | (np.diff(dates) >= RUN_GAP_NS)
+        )
+        return np.cumsum(starts)
+    
+    def _calculate_priorities(self, days_missed: pd.Series, tasks: pd.Series) -> np.ndarray:
+        """Calculate priority based on days missed and task type for all runs at once"""
+        # Match keywords once per distinct task name and map back through the category codes
+        task_cat = tasks.astype('category')
+        task_lower = task_cat.cat.categories.str.lower()
+        codes = task_cat.cat.codes.to_numpy()
+        is_critical = np.asarray(task_lower.str.contains(CRITICAL_RE, regex=True), dtype=bool)[codes]
+        is_high = np.asarray(task_lower.str.contains(HIGH_RE, regex=True), dtype=bool)[codes]
+        days = days_missed.to_numpy()
         
-        # Regular tasks
-        if days_missed >= 5:
-            return 'Critical'
-        elif days_missed >= 3:
-            return 'High'
-        elif days_missed >= 2:
-            return 'Medium'
-        else:
-            return 'Low'
+        # Keyword rules take precedence, then regular tasks by days missed
+        return np.select(
+            [is_critical, is_high & (days >= 3), is_high, days >= 5, days >= 3, days >= 2],
+            ['Critical', 'Critical', 'High', 'Critical', 'High', 'Medium'],
+            default='Low'
+        )
     
     def validate_data(self, df: pd.DataFrame) -> Tuple[bool, str]:
         """Enhanced data validation"""
@@ -261,15 +270,22 @@ class DailyReportProcessor:
                 'most_problematic_task': 'None'
             }
         
+        # One count per column, reused for the distinct totals and the top entries
+        # (zero counts only appear for unused categories and are dropped)
+        employee_counts, task_counts, action_counts, priority_counts = (
+            results_df[col].value_counts().loc[lambda s: s > 0]
+            for col in ('Employee', 'Task', 'Action', 'Priority')
+        )
+        
         summary = {
             'total_issues': len(results_df),
-            'employees_affected': results_df['Employee'].nunique(),
-            'tasks_affected': results_df['Task'].nunique(),
-            'action_breakdown': results_df['Action'].value_counts().to_dict(),
-            'priority_breakdown': results_df['Priority'].value_counts().to_dict(),
+            'employees_affected': len(employee_counts),
+            'tasks_affected': len(task_counts),
+            'action_breakdown': action_counts.to_dict(),
+            'priority_breakdown': priority_counts.to_dict(),
             'avg_days_missed': results_df['Days Missed'].mean(),
-            'most_problematic_employee': results_df['Employee'].value_counts().index[0] if not results_df.empty else 'None',
-            'most_problematic_task': results_df['Task'].value_counts().index[0] if not results_df.empty else 'None'
+            'most_problematic_employee': employee_counts.index[0],
+            'most_problematic_task': task_counts.index[0]
         }
         
         return summary
\ No newline at end of file
@@ -1,6 +1,6 @@
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
-import random
 
 def generate_sample_data() -> pd.DataFrame:
     """
@@ -18,42 +18,47 @@ def generate_sample_data() -> pd.DataFrame:
     ]
     
     # Generate data for the last 10 days
-    start_date = datetime.now() - timedelta(days=9)
-    dates = [start_date + timedelta(days=i) for i in range(10)]
+    now = datetime.now()
+    start_date = now - timedelta(days=9)
+    dates = np.array([start_date + timedelta(days=i) for i in range(10)])
     
-    data = []
+    rng = np.random.default_rng()
     
-    for employee in employees:
-        for date in dates:
-            # Each employee gets 3-4 random tasks per day
-            daily_tasks = random.sample(tasks, random.randint(3, 4))
-            
-            for task in daily_tasks:
-                # 85% chance of "Done", 15% chance of "Not Done"
-                status = "Done" if random.random() > 0.15 else "Not Done"
-                
-                # Create some patterns for demonstration
-                if employee == "Mike Davis" and task == "Equipment Maintenance":
-                    if date.day % 3 == 0:  # Every 3rd day
-                        status = "Not Done"
-                
-                if employee == "Sarah Johnson" and task == "Report Submission":
-                    if date >= datetime.now() - timedelta(days=3):  # Last 3 days
-                        status = "Not Done"
-                
-                data.append({
-                    'Employee': employee,
-                    'Task': task,
-                    'Date': date.strftime('%Y-%m-%d'),
-                    'Status': status
-                })
+    # Each employee gets 3-4 distinct random tasks per day: shuffle the task
+    # indices for every (employee, day) slot and keep the first 3 or 4
+    slots = len(employees) * len(dates)
+    task_order = rng.random((slots, len(tasks))).argsort(axis=1)
+    tasks_per_slot = rng.integers(3, 5, size=slots)
+    task_idx = task_order[np.arange(len(tasks)) < tasks_per_slot[:, None]]
+    slot_idx = np.repeat(np.arange(slots), tasks_per_slot)
+    emp_idx = slot_idx // len(dates)
+    date_idx = slot_idx % len(dates)
     
-    return pd.DataFrame(data)
+    employee_col = np.array(employees)[emp_idx]
+    task_col = np.array(tasks)[task_idx]
+    
+    # 85% chance of "Done", 15% chance of "Not Done"
+    status_col = np.where(rng.random(len(slot_idx)) > 0.15, "Done", "Not Done")
+    
+    # Create some patterns for demonstration
+    every_third_day = np.array([date.day % 3 == 0 for date in dates])
+    last_three_days = dates > now - timedelta(days=3)
+    status_col[(employee_col == "Mike Davis") & (task_col == "Equipment Maintenance") & every_third_day[date_idx]] = "Not Done"
+    status_col[(employee_col == "Sarah Johnson") & (task_col == "Report Submission") & last_three_days[date_idx]] = "Not Done"
+    
+    return pd.DataFrame({
+        'Employee': employee_col,
+        'Task': task_col,
+        'Date': np.array([date.strftime('%Y-%m-%d') for date in dates])[date_idx],
+        'Status': status_col
+    })
 
 def save_sample_excel():
     """
     Save sample data as Excel file for download.
     """
     df = generate_sample_data()
-    df.to_excel('sample_daily_reports.xlsx', index=False)
+    # xlsxwriter streams rows out instead of building openpyxl cell objects
+    with pd.ExcelWriter('sample_daily_reports.xlsx', engine='xlsxwriter') as writer:
+        df.to_excel(writer, index=False)
     return df
\ No newline at end of file